@@ -5,11 +5,20 @@
 
 from __future__ import annotations
 
+import codecs
+import collections
+import functools
+import itertools
 import os
 import queue
+import selectors
 import sys
 import textwrap
-from typing import Any, Callable, Dict, Optional, TextIO
+import threading
+import time
+import warnings
+import weakref
+from typing import Any, BinaryIO, Callable, Deque, Dict, List, Optional, Set, TextIO, Tuple, Union
 
 from composer.core.state import State
 from composer.loggers.logger import Logger, LogLevel, format_log_data_value
@@ -18,6 +27,38 @@ from composer.utils.file_helpers import FORMAT_NAME_WITH_DIST_TABLE, format_name
 
 __all__ = ['FileLogger']
 
+# A write to the logfile, as a (format_fn, prefix, s) tuple
+_Write = Tuple[Callable[[str, str], str], str, str]
+
+_HYPERPARAMETER_PREFIX = '[hyperparameter]: '
+
+# The maximum number of buffers in a single call to :func:`os.writev` (``IOV_MAX`` on Linux and macOS)
+_IOV_MAX = 1024
+
+# Once capturing is finished, the maximum time, in seconds, to read output remaining in a captured file descriptor
+_FD_DRAIN_TIMEOUT = 0.5
+
+
+def _after_fork_in_child(file_logger_ref: 'weakref.ReferenceType[FileLogger]'):
+    file_logger = file_logger_ref()
+    if file_logger is not None:
+        file_logger._reset_after_fork()
+
+
+def _writev(fd: int, buffers: Deque[Union[bytes, memoryview]]):
+    """Write all ``buffers`` to ``fd`` with :func:`os.writev`, retrying partial writes.
+
+    Data is removed from ``buffers`` as it is written, so if an error is raised, ``buffers`` contains only the data
+    that was not written.
+    """
+    while buffers:
+        num_bytes = os.writev(fd, list(itertools.islice(buffers, _IOV_MAX)))
+        # Remove the buffers that were fully written, and trim the one that was partially written
+        while buffers and num_bytes >= len(buffers[0]):
+            num_bytes -= len(buffers.popleft())
+        if num_bytes > 0:
+            buffers[0] = memoryview(buffers[0])[num_bytes:]
+
 
 class FileLogger(LoggerDestination):  # noqa: D101
     __doc__ = f"""Log data to a file.
@@ -80,7 +121,7 @@ class FileLogger(LoggerDestination):  # noqa: D101
 
         artifact_name (str, optional): Format string for the logfile's artifact name.
 
-            The logfile will be periodically logged (according to the ``flush_interval``) as a file artifact.
+            The logfile will be periodically logged (according to the ``artifact_flush_interval``) as a file artifact.
             The artifact name will be determined by this format string.
 
             .. seealso:: :doc:`Artifact Logging</trainer/artifact_logging>` for notes for file artifact logging.
@@ -95,11 +136,28 @@ class FileLogger(LoggerDestination):  # noqa: D101
             Default: ``None`` (which uses the same format string as ``filename``)
         capture_stdout (bool, optional): Whether to include the ``stdout``in ``filename``. (default: ``True``)
         capture_stderr (bool, optional): Whether to include the ``stderr``in ``filename``. (default: ``True``)
+        capture_fds (bool, optional): Whether to capture ``stdout`` and ``stderr`` at the file descriptor level.
+            By default, ``stdout`` and ``stderr`` are captured by intercepting calls to :data:`sys.stdout` and
+            :data:`sys.stderr`, which does not include output written directly to file descriptors ``1`` and ``2``
+            (e.g. by C extensions). If ``True``, these file descriptors are instead redirected through pipes, which
+            are read by background threads that write to the logfile and echo to the original file descriptors,
+            until the logger is closed. This option is only supported on POSIX systems. (default: ``False``)
+
+            .. note::
+
+                Subprocesses that are forked while capturing (e.g. dataloader workers) inherit the pipes. As the
+                pipes are no longer read once the logger is closed, output that they write afterwards fails with a
+                :exc:`BrokenPipeError`.
         buffer_size (int, optional): Buffer size. See :py:func:`open`.
-            Default: ``1`` for line buffering.
+            Default: ``1``, which leaves the logfile unbuffered: each batch of writes is issued directly to the file,
+            without userspace buffering.
         log_traces (bool, optional): Whether to log algorithm traces. See :class:`~.Engine` for more detail.
         flush_interval (int, optional): How frequently to flush the log to the file in batches
             Default: ``100``.
+        artifact_flush_interval (int, optional): How frequently to log the logfile as a file artifact, in number of
+            times the log is flushed to the file. As the entire logfile is logged each time, logging it less often
+            than it is flushed avoids repeatedly re-uploading a growing file. The logfile is always logged on
+            :attr:`.Event.FIT_END` and when the logger is closed. Default: ``10``.
         overwrite (bool, optional): Whether to overwrite an existing logfile. (default: ``False``)
     """
 
@@ -110,11 +168,15 @@ class FileLogger(LoggerDestination):  # noqa: D101
         *,
         capture_stdout: bool = True,
         capture_stderr: bool = True,
+        capture_fds: bool = False,
         buffer_size: int = 1,
         log_traces: bool = True,
         flush_interval: int = 100,
+        artifact_flush_interval: int = 10,
         overwrite: bool = False,
     ) -> None:
+        if capture_fds and os.name != 'posix':
+            raise ValueError('capture_fds is only supported on POSIX systems')
         self.filename_format = filename
         if artifact_name is None:
             artifact_name = filename.replace(os.path.sep, '/')
@@ -122,22 +184,70 @@ class FileLogger(LoggerDestination):  # noqa: D101
         self.buffer_size = buffer_size
         self.should_log_traces = log_traces
         self.flush_interval = flush_interval
+        self.artifact_flush_interval = artifact_flush_interval
+        self._flushes_since_artifact = 0
+        # Whether anything was written to the file since it was last flushed, and since it was last logged as an
+        # artifact. Flushes (and artifact logging) are skipped when nothing was written.
+        self._dirty = False
+        self._artifact_dirty = False
         self.is_batch_interval = False
         self.is_epoch_interval = False
-        self.file: Optional[TextIO] = None
+        self.file: Optional[BinaryIO] = None
+        self._unbuffered = False
         self.overwrite = overwrite,
-        self._queue: queue.Queue[str] = queue.Queue()
-        self._run_name = None
+        # Encoded writes that are not yet written to the file
+        self._queue: Deque[Union[bytes, memoryview]] = collections.deque()
+        # The filename and artifact name are formatted once the run name is known, on Event.INIT
+        self._filename: Optional[str] = None
+        self._artifact_name: Optional[str] = None
         # Track whether the next line is on a newline
         # (and if so, then the prefix should be appended)
         self._is_newline = True
         self._closed = False
+        # The logfile is fsynced in a background thread, so the training loop does not block on disk writes.
+        # Fsync requests are coalesced -- the thread performs one fsync for all requests since its last fsync.
+        self._fsync_thread: Optional[threading.Thread] = None
+        self._fsync_requested = threading.Event()
+        self._fsync_thread_finished = threading.Event()
+        # The first exception raised by the fsync thread, which is re-raised on the next flush or when closing
+        self._fsync_exception: Optional[Exception] = None
+        # Once the logfile is open, writes are formatted and written to it by a background thread, so calls to
+        # ``print()`` and the logging methods do not block on file I/O. Writes are processed in the order they were
+        # submitted. Before Event.INIT, writes are formatted synchronously and enqueued until the file is open.
+        # Items on the queue are either a ``(format_fn, prefix, s)`` write, a :class:`threading.Event` that is set
+        # once all prior writes are processed, or ``None`` to shut down the thread.
+        self._write_queue: queue.SimpleQueue[Union[None, threading.Event, _Write]] = queue.SimpleQueue()
+        # Lock for ``self.file``, ``self._queue``, and ``self._is_newline``, which are shared with the write thread
+        self._file_lock = threading.Lock()
+        self._write_thread: Optional[threading.Thread] = None
+        # The first exception raised by the write thread, which is re-raised on the next flush or when closing
+        self._write_exception: Optional[Exception] = None
+        self._fork_handler_registered = False
+        # Mapping of each captured file descriptor to a duplicate of the original file descriptor
+        self._original_fds: Dict[int, int] = {}
+        self._fd_capture_threads: List[threading.Thread] = []
+        # The read ends of the pipes, which are closed in forked child processes
+        self._fd_capture_read_fds: Set[int] = set()
+        self._fd_capture_finished = threading.Event()
 
         if capture_stdout:
-            sys.stdout.write = self._get_new_writer('[stdout]: ', sys.stdout.write)
+            if capture_fds:
+                self._capture_fd(1, '[stdout]: ', sys.stdout)
+            else:
+                sys.stdout.write = self._get_new_writer('[stdout]: ', sys.stdout.write)
 
         if capture_stderr:
-            sys.stderr.write = self._get_new_writer('[stderr]: ', sys.stderr.write)
+            if capture_fds:
+                self._capture_fd(2, '[stderr]: ', sys.stderr)
+            else:
+                sys.stderr.write = self._get_new_writer('[stderr]: ', sys.stderr.write)
+
+    def _register_fork_handler(self):
+        if self._fork_handler_registered or not hasattr(os, 'register_at_fork'):
+            return
+        # A weak reference, since fork handlers cannot be unregistered
+        os.register_at_fork(after_in_child=functools.partial(_after_fork_in_child, weakref.ref(self)))
+        self._fork_handler_registered = True
 
     def _get_new_writer(self, prefix: str, original_writer: Callable[[str], int]):
         """Returns a writer that intercepts calls to the ``original_writer``."""
@@ -149,25 +259,93 @@ class FileLogger(LoggerDestination):  # noqa: D101
 
         return new_write
 
+    def _capture_fd(self, fd: int, prefix: str, stream: TextIO):
+        """Redirects ``fd`` through a pipe, which is read by a background thread that writes to the logfile."""
+        # Flush anything buffered for the original file descriptor
+        stream.flush()
+        original_fd = os.dup(fd)
+        read_fd, write_fd = os.pipe()
+        os.dup2(write_fd, fd)
+        os.close(write_fd)
+        self._original_fds[fd] = original_fd
+        self._fd_capture_read_fds.add(read_fd)
+        self._register_fork_handler()
+        thread = threading.Thread(target=self._read_fd, args=(fd, prefix, read_fd, original_fd), daemon=True)
+        thread.start()
+        self._fd_capture_threads.append(thread)
+
+    def _read_fd(self, fd: int, prefix: str, read_fd: int, original_fd: int):
+        try:
+            self._read_fd_until_finished(prefix, read_fd, original_fd)
+        except Exception as e:
+            # Nothing reads the pipe once this thread exits, so writes to ``fd`` would block once the pipe is full.
+            # Instead, restore the original file descriptor, which stops capturing it.
+            os.dup2(original_fd, fd)
+            warnings.warn(f'FileLogger stopped capturing file descriptor {fd} due to an error: {e!r}')
+        finally:
+            self._fd_capture_read_fds.discard(read_fd)
+            os.close(read_fd)
+
+    def _read_fd_until_finished(self, prefix: str, read_fd: int, original_fd: int):
+        # Output is read as bytes, so multi-byte characters can be split across reads
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        with selectors.DefaultSelector() as selector:
+            selector.register(read_fd, selectors.EVENT_READ)
+            # Poll rather than blocking on the read, so the thread can check whether capturing is finished
+            while not self._fd_capture_finished.is_set():
+                if selector.select(timeout=0.1):
+                    chunk = os.read(read_fd, 65536)
+                    if not chunk:
+                        return
+                    self._write_captured_output(prefix, original_fd, decoder, chunk)
+        # The pipe does not reach EOF if forked subprocesses still hold the write end, and they may keep writing.
+        # So, read only what is already in the pipe, for at most a short time.
+        os.set_blocking(read_fd, False)
+        deadline = time.monotonic() + _FD_DRAIN_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                chunk = os.read(read_fd, 65536)
+            except BlockingIOError:
+                return
+            if not chunk:
+                return
+            self._write_captured_output(prefix, original_fd, decoder, chunk)
+
+    def _write_captured_output(self, prefix: str, original_fd: int, decoder: codecs.IncrementalDecoder, chunk: bytes):
+        # Echo to the original file descriptor, so the output still appears in the terminal
+        _writev(original_fd, collections.deque([chunk]))
+        self.write(prefix, decoder.decode(chunk))
+
+    def _stop_capturing_fds(self):
+        if not self._original_fds:
+            return
+        # Flush any output that is still buffered, so it is captured
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for fd, original_fd in self._original_fds.items():
+            os.dup2(original_fd, fd)
+        # The capture threads write any output remaining in the pipes before shutting down
+        self._fd_capture_finished.set()
+        for thread in self._fd_capture_threads:
+            thread.join()
+        for original_fd in self._original_fds.values():
+            os.close(original_fd)
+        self._original_fds.clear()
+        self._fd_capture_threads.clear()
+
     @property
     def filename(self) -> str:
         """The filename for the logfile."""
-        if self._run_name is None:
+        if self._filename is None:
             raise RuntimeError('The run name is not set. The engine should have been set on Event.INIT')
-        name = format_name_with_dist(self.filename_format, run_name=self._run_name)
-
-        return name
+        return self._filename
 
     @property
     def artifact_name(self) -> str:
         """The artifact name for the logfile."""
-        if self._run_name is None:
+        if self._artifact_name is None:
             raise RuntimeError('The run name is not set. The engine should have been set on Event.INIT')
-        name = format_name_with_dist(self.artifact_name_format, run_name=self._run_name)
-
-        name.lstrip('/')
-
-        return name
+        return self._artifact_name
 
     def epoch_start(self, state: State, logger: Logger) -> None:
         # Flush any log calls that occurred during INIT or FIT_START
@@ -177,39 +355,57 @@ class FileLogger(LoggerDestination):  # noqa: D101
         if self.should_log_traces:
             for trace_name, trace in traces.items():
                 trace_str = format_log_data_value(trace)
-                self.write(
+                self._write_record(
                     f'[trace]: {trace_name}:',
                     trace_str + '\n',
                 )
 
     def log_metrics(self, metrics: Dict[str, float], step: Optional[int] = None) -> None:
+        # The prefix is the same for every metric in the call
+        prefix = f'[metric][batch={step}]: '
         for metric_name, metric in metrics.items():
             metric_str = format_log_data_value(metric)
-            self.write(
-                f'[metric][batch={step}]: ',
+            self._write_record(
+                prefix,
                 f'{metric_name}: {metric_str} \n',
             )
 
     def log_hyperparameters(self, hyperparameters: Dict[str, Any]):
         for hparam_name, hparam_value in hyperparameters.items():
             hparam_str = format_log_data_value(hparam_value)
-            self.write(
-                f'[hyperparameter]: ',
+            self._write_record(
+                _HYPERPARAMETER_PREFIX,
                 f'{hparam_name}: {hparam_str} \n',
             )
 
     def init(self, state: State, logger: Logger) -> None:
         del logger  # unused
-        self._is_newline = True
-        self._run_name = state.run_name
+        self._filename = format_name_with_dist(self.filename_format, run_name=state.run_name)
+        self._artifact_name = format_name_with_dist(self.artifact_name_format, run_name=state.run_name).lstrip('/')
         if self.file is not None:
             raise RuntimeError('The file logger is already initialized')
         file_dirname = os.path.dirname(self.filename)
         if file_dirname:
             os.makedirs(file_dirname, exist_ok=True)
-        mode = 'w+' if self.overwrite else 'x+'
-        self.file = open(self.filename, mode, buffering=self.buffer_size)
-        self._flush_queue()
+        mode = 'wb' if self.overwrite else 'xb'
+        # The logfile is opened in binary mode, bypassing the TextIO layer, as writes are already coalesced.
+        # Binary files do not support line buffering, so instead the file is unbuffered, and each batch of writes
+        # is written directly to the file.
+        buffering = 0 if self.buffer_size == 1 else self.buffer_size
+        self._unbuffered = buffering == 0
+        with self._file_lock:
+            self._is_newline = True
+            self.file = open(self.filename, mode, buffering=buffering)
+            # Always log a new logfile as an artifact at least once, even if it is empty
+            self._artifact_dirty = True
+            self._flush_queue()
+        self._register_fork_handler()
+        self._write_thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._write_thread.start()
+        self._fsync_requested.clear()
+        self._fsync_thread_finished.clear()
+        self._fsync_thread = threading.Thread(target=self._fsync_loop, args=(self.file.fileno(),), daemon=True)
+        self._fsync_thread.start()
 
     def batch_end(self, state: State, logger: Logger) -> None:
         assert self.file is not None
@@ -229,65 +425,226 @@ class FileLogger(LoggerDestination):  # noqa: D101
 
         .. note::
 
-            If the ``write`` occurs before the :attr:`.Event.INIT` event,
-            the write will be enqueued, as the file is not yet open.
+            Once the logfile is open, writes are performed asynchronously by a background thread, in the order
+            they were submitted. If the ``write`` occurs before the :attr:`.Event.INIT` event, the write will be
+            enqueued, as the file is not yet open.
 
         Args:
             prefix (str): A prefix for each line in the logfile.
             s (str): The string to write. Each line will be prefixed with ``prefix``.
         """
-        formatted_lines = []
-        for line in s.splitlines(True):
-            if self._is_newline:
-                # Only print the prefix if it is a newline
-                # and the line is not empty
-                if line == os.linesep:
-                    formatted_lines.append(line)
-                else:
-                    formatted_lines.append(f'{prefix}{line}')
-                self._is_newline = False
-            else:
-                # Otherwise, append the line without the prefix
-                formatted_lines.append(line)
-            if line.endswith(os.linesep):
-                # if the line ends with newline, record that the next
-                # line should start with the prefix
-                self._is_newline = True
-        formatted_s = ''.join(formatted_lines)
-        if self.file is None:
-            self._queue.put_nowait(formatted_s)
+        self._submit_write(self._format, prefix, s)
+
+    def _write_record(self, prefix: str, s: str):
+        """Write a log record ``s``, which must end with a newline, to the logfile."""
+        self._submit_write(self._format_record, prefix, s)
+
+    def _reset_after_fork(self):
+        # Only the forking thread exists in a forked child process, so without the write thread, writes would be
+        # queued but never written. Instead, the child writes synchronously. The locks and events are recreated,
+        # since they could have been held by a thread in the parent process at the time of the fork.
+        self._write_thread = None
+        self._write_queue = queue.SimpleQueue()
+        self._file_lock = threading.Lock()
+        self._fsync_thread = None
+        self._fsync_requested = threading.Event()
+        self._fsync_thread_finished = threading.Event()
+        self._fsync_exception = None
+        # If the child held the read ends of the pipes, then once the logger is closed in the parent process, writes
+        # to the captured file descriptors would block on the full pipes, rather than failing
+        for read_fd in self._fd_capture_read_fds:
+            os.close(read_fd)
+        self._fd_capture_read_fds.clear()
+        self._fd_capture_threads.clear()
+
+    def _submit_write(self, format_fn: Callable[[str, str], str], prefix: str, s: str):
+        if self._write_thread is None:
+            # The write thread is started on Event.INIT and shut down once the logger is closed. It also does not
+            # exist in forked child processes.
+            self._process_writes([(format_fn, prefix, s)])
         else:
-            # Flush the queue, so all prints will be in order
-            self._flush_queue()
-            # Then, write to the file
-            print(formatted_s, file=self.file, flush=False, end='')
+            self._write_queue.put((format_fn, prefix, s))
 
-    def _flush_queue(self):
+    def _write_loop(self):
         while True:
-            try:
-                s = self._queue.get_nowait()
-            except queue.Empty:
-                break
-            print(s, file=self.file, flush=False, end='')
+            items = [self._write_queue.get()]
+            # Take all other pending items, so their writes can be written to the file together
+            while not self._write_queue.empty() and len(items) < _IOV_MAX:
+                items.append(self._write_queue.get_nowait())
+            writes: List[_Write] = []
+            for item in items:
+                if isinstance(item, tuple):
+                    writes.append(item)
+                    continue
+                # Process all prior writes before handling the barrier or shutdown
+                self._try_process_writes(writes)
+                writes = []
+                if item is None:
+                    return
+                item.set()
+            self._try_process_writes(writes)
+
+    def _try_process_writes(self, writes: List[_Write]):
+        # The write thread keeps running after an error, so barriers are still set and the shutdown is processed
+        try:
+            self._process_writes(writes)
+        except Exception as e:
+            if self._write_exception is None:
+                self._write_exception = e
+
+    def _raise_write_exception(self):
+        if self._write_exception is not None:
+            exception = self._write_exception
+            self._write_exception = None
+            raise exception
+
+    def _raise_fsync_exception(self):
+        if self._fsync_exception is not None:
+            exception = self._fsync_exception
+            self._fsync_exception = None
+            raise exception
+
+    def _wait_for_writes(self):
+        """Block until the write thread has processed all submitted writes."""
+        if self._write_thread is None:
+            return
+        writes_processed = threading.Event()
+        self._write_queue.put(writes_processed)
+        while not writes_processed.wait(timeout=1.0):
+            if not self._write_thread.is_alive():
+                raise RuntimeError('The FileLogger write thread exited unexpectedly')
+        self._raise_write_exception()
+
+    def _process_writes(self, writes: List[_Write]):
+        if not writes:
+            return
+        with self._file_lock:
+            self._queue.extend(
+                format_fn(prefix, s).encode('utf-8', errors='replace') for (format_fn, prefix, s) in writes)
+            if self.file is not None:
+                self._flush_queue()
+
+    def _format(self, prefix: str, s: str) -> str:
+        if not s:
+            return s
+        ends_with_newline = s.endswith(os.linesep)
+        if ends_with_newline:
+            s = s[:-len(os.linesep)]
+        formatted_s = s.replace(os.linesep, os.linesep + prefix)
+        if self._is_newline and s and not s.startswith(os.linesep):
+            # Only print the prefix if it is a newline and the line is not empty
+            formatted_s = prefix + formatted_s
+        if ends_with_newline:
+            formatted_s += os.linesep
+        if prefix:
+            # Empty lines are not prefixed. Repeat the replacement, since consecutive empty lines overlap.
+            empty_line = os.linesep + prefix + os.linesep
+            while empty_line in formatted_s:
+                formatted_s = formatted_s.replace(empty_line, os.linesep * 2)
+        # if the string ends with newline, record that the next
+        # line should start with the prefix
+        self._is_newline = ends_with_newline
+        return formatted_s
+
+    def _format_record(self, prefix: str, s: str) -> str:
+        # Records are usually a single line, which can be formatted without scanning for lines to prefix
+        if os.linesep in s[:-len(os.linesep)]:
+            return self._format(prefix, s)
+        if self._is_newline:
+            s = prefix + s
+        self._is_newline = True
+        return s
 
-    def _flush_file(self, logger: Logger) -> None:
+    def _flush_queue(self):
         assert self.file is not None
+        if self._queue:
+            self._dirty = True
+            # Written data is removed from the queue, so if the write fails, only the unwritten data is retried
+            self._write_to_file(self._queue)
 
-        self._flush_queue()
+    def _write_to_file(self, buffers: Deque[Union[bytes, memoryview]]):
+        assert self.file is not None
+        if self._unbuffered and hasattr(os, 'writev'):
+            # Submit all buffers in a single syscall, without concatenating them first
+            _writev(self.file.fileno(), buffers)
+        else:
+            # Joined into a single buffer, which is trimmed as it is written
+            data = memoryview(b''.join(buffers))
+            buffers.clear()
+            buffers.append(data)
+            while buffers[0]:
+                # Unbuffered writes may be partial
+                buffers[0] = buffers[0][self.file.write(buffers[0]):]
+            buffers.clear()
+
+    def _flush_file(self, logger: Logger, force_log_artifact: bool = False) -> None:
+        assert self.file is not None
 
-        self.file.flush()
-        os.fsync(self.file.fileno())
-        logger.file_artifact(LogLevel.FIT, self.artifact_name, self.file.name, overwrite=True)
+        self._wait_for_writes()
+        if self._fsync_thread is not None:
+            # Once the fsync thread is shut down, fsync errors are instead re-raised by close()
+            self._raise_fsync_exception()
+        with self._file_lock:
+            self._flush_queue()
+            dirty = self._dirty
+            self._dirty = False
+            if dirty:
+                self.file.flush()
+        if dirty:
+            self._fsync_requested.set()
+            self._flushes_since_artifact += 1
+            self._artifact_dirty = True
+        if not self._artifact_dirty:
+            return
+        if force_log_artifact or self._flushes_since_artifact >= self.artifact_flush_interval:
+            self._flushes_since_artifact = 0
+            self._artifact_dirty = False
+            logger.file_artifact(LogLevel.FIT, self.artifact_name, self.file.name, overwrite=True)
+
+    def _fsync_loop(self, fileno: int) -> None:
+        while True:
+            self._fsync_requested.wait()
+            self._fsync_requested.clear()
+            if self._fsync_thread_finished.is_set():
+                break
+            # The fsync thread keeps running after an error, so later flushes are still fsynced
+            try:
+                os.fsync(fileno)
+            except Exception as e:
+                if self._fsync_exception is None:
+                    self._fsync_exception = e
 
     def fit_end(self, state: State, logger: Logger) -> None:
         # Flush the file on fit_end, in case if was not flushed on epoch_end and the trainer is re-used
         # (which would defer when `self.close()` would be invoked)
-        self._flush_file(logger)
+        self._flush_file(logger, force_log_artifact=True)
 
     def close(self, state: State, logger: Logger) -> None:
         del state  # unused
         self._closed = True  # Stop intercepting calls to stdout/stderr
+        self._stop_capturing_fds()
+        if self._write_thread is not None:
+            # The write thread processes all pending writes before shutting down
+            self._write_queue.put(None)
+            self._write_thread.join()
+            self._write_thread = None
+            # Process any writes that were submitted after the shutdown, but before the thread was cleared above
+            while not self._write_queue.empty():
+                item = self._write_queue.get_nowait()
+                if isinstance(item, tuple):
+                    self._process_writes([item])
+                elif item is not None:
+                    item.set()
         if self.file is not None:
-            self._flush_file(logger)
+            if self._fsync_thread is not None:
+                self._fsync_thread_finished.set()
+                self._fsync_requested.set()
+                self._fsync_thread.join()
+                self._fsync_thread = None
+            self._flush_file(logger, force_log_artifact=True)
+            # Now that the fsync thread is shut down, fsync any remaining writes before closing the file
+            os.fsync(self.file.fileno())
             self.file.close()
             self.file = None
+        self._raise_write_exception()
+        self._raise_fsync_exception()
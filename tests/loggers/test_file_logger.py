@@ -3,12 +3,16 @@
 
 import os
 import pathlib
+import signal
 import sys
+import threading
+import time
 
+import pytest
 from torch.utils.data import DataLoader
 
 from composer import Callback, Event, State, Trainer
-from composer.loggers import FileLogger, Logger, LoggerDestination, LogLevel
+from composer.loggers import FileLogger, Logger, LoggerDestination, LogLevel, file_logger
 from composer.utils.collect_env import disable_env_report
 from tests.common.datasets import RandomClassificationDataset
 from tests.common.models import SimpleModel
@@ -47,6 +51,50 @@ def test_file_logger(dummy_state: State, tmp_path: pathlib.Path):
         ]
 
 
+def test_file_logger_artifact_name(dummy_state: State, tmp_path: pathlib.Path):
+    log_file_name = os.path.join(tmp_path, 'output.log')
+    log_destination = FileLogger(
+        filename=log_file_name,
+        artifact_name='/{run_name}/rank{rank}.log',
+        capture_stderr=False,
+        capture_stdout=False,
+    )
+    file_tracker_destination = FileArtifactLoggerTracker()
+    logger = Logger(dummy_state, destinations=[log_destination, file_tracker_destination])
+    log_destination.run_event(Event.INIT, dummy_state, logger)
+    assert log_destination.filename == log_file_name
+    # Leading slashes should be stripped from the artifact name
+    assert log_destination.artifact_name == f'{dummy_state.run_name}/rank0.log'
+    log_destination.close(dummy_state, logger)
+    assert file_tracker_destination.logged_artifacts[-1][1] == f'{dummy_state.run_name}/rank0.log'
+
+
+def test_file_logger_artifact_flush_interval(dummy_state: State, tmp_path: pathlib.Path):
+    log_file_name = os.path.join(tmp_path, 'output.log')
+    log_destination = FileLogger(
+        filename=log_file_name,
+        flush_interval=1,
+        artifact_flush_interval=2,
+        capture_stderr=False,
+        capture_stdout=False,
+    )
+    file_tracker_destination = FileArtifactLoggerTracker()
+    logger = Logger(dummy_state, destinations=[log_destination, file_tracker_destination])
+    log_destination.run_event(Event.INIT, dummy_state, logger)
+    for _ in range(3):
+        logger.log_metrics({'loss': 2}, step=1)
+        log_destination.run_event(Event.BATCH_END, dummy_state, logger)
+    # The logfile should be logged on every other flush
+    assert len(file_tracker_destination.logged_artifacts) == 1
+    # Flushes where nothing was written should be skipped
+    for _ in range(3):
+        log_destination.run_event(Event.BATCH_END, dummy_state, logger)
+    assert len(file_tracker_destination.logged_artifacts) == 1
+    # And the logfile should always be logged when the logger is closed, if it was written to since it was last logged
+    log_destination.close(dummy_state, logger)
+    assert len(file_tracker_destination.logged_artifacts) == 2
+
+
 def test_file_logger_capture_stdout_stderr(dummy_state: State, tmp_path: pathlib.Path):
     log_file_name = os.path.join(tmp_path, 'output.log')
     log_destination = FileLogger(filename=log_file_name,
@@ -72,6 +120,297 @@ def test_file_logger_capture_stdout_stderr(dummy_state: State, tmp_path: pathlib
         ]
 
 
+def test_file_logger_line_prefixes(dummy_state: State, tmp_path: pathlib.Path):
+    log_file_name = os.path.join(tmp_path, 'output.log')
+    log_destination = FileLogger(filename=log_file_name, capture_stderr=False, capture_stdout=False)
+    logger = Logger(dummy_state, destinations=[log_destination])
+    log_destination.write('[prefix]: ', 'queued\n')
+    log_destination.run_event(Event.INIT, dummy_state, logger)
+    log_destination.write('[prefix]: ', 'first\nsecond\n')
+    log_destination.write('[prefix]: ', 'empty lines\n\n\nare not prefixed\n')
+    log_destination.write('[prefix]: ', 'partial ')
+    log_destination.write('[prefix]: ', 'line\n')
+    log_destination.close(dummy_state, logger)
+    with open(log_file_name, 'r') as f:
+        assert f.readlines() == [
+            '[prefix]: queued\n',
+            '[prefix]: first\n',
+            '[prefix]: second\n',
+            '[prefix]: empty lines\n',
+            '\n',
+            '\n',
+            '[prefix]: are not prefixed\n',
+            '[prefix]: partial line\n',
+        ]
+
+
+def test_file_logger_partial_writes(dummy_state: State, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path):
+    max_buffers_per_write = 0
+
+    def short_writev(fd, buffers):
+        # Write only half of the requested bytes, as os.writev() may do
+        nonlocal max_buffers_per_write
+        max_buffers_per_write = max(max_buffers_per_write, len(buffers))
+        data = b''.join(buffers)
+        return os.write(fd, data[:max(1, len(data) // 2)])
+
+    monkeypatch.setattr(os, 'writev', short_writev)
+    log_file_name = os.path.join(tmp_path, 'output.log')
+    log_destination = FileLogger(filename=log_file_name)
+    # Lines written before INIT are written to the logfile together, in more buffers than os.writev() accepts
+    lines = [f'Line {i}\n' for i in range(3000)]
+    for line in lines:
+        log_destination.write('[stdout]: ', line)
+    logger = Logger(dummy_state, destinations=[log_destination])
+    log_destination.run_event(Event.INIT, dummy_state, logger)
+    log_destination.close(dummy_state, logger)
+    assert max_buffers_per_write == file_logger._IOV_MAX
+    with open(log_file_name, 'r') as f:
+        assert f.readlines() == ['[stdout]: ' + line for line in lines]
+
+
+def test_file_logger_write_error_after_partial_write(dummy_state: State, monkeypatch: pytest.MonkeyPatch,
+                                                     tmp_path: pathlib.Path):
+    writev = os.writev
+    num_writes = 0
+
+    def fail_second_writev(fd, buffers):
+        nonlocal num_writes
+        num_writes += 1
+        if num_writes == 2:
+            raise OSError('No space left on device')
+        return writev(fd, buffers)
+
+    monkeypatch.setattr(os, 'writev', fail_second_writev)
+    log_file_name = os.path.join(tmp_path, 'output.log')
+    log_destination = FileLogger(filename=log_file_name)
+    # More lines than fit in a single call to os.writev(), so the error occurs after some lines were written
+    lines = [f'Line {i}\n' for i in range(3000)]
+    for line in lines:
+        log_destination.write('[stdout]: ', line)
+    logger = Logger(dummy_state, destinations=[log_destination])
+    with pytest.raises(OSError, match='No space left on device'):
+        log_destination.run_event(Event.INIT, dummy_state, logger)
+    log_destination.close(dummy_state, logger)
+    # Only the lines that were not written should be retried
+    with open(log_file_name, 'r') as f:
+        assert f.readlines() == ['[stdout]: ' + line for line in lines]
+
+
+@pytest.mark.parametrize('buffer_size', [-1, 4096])
+def test_file_logger_buffered(dummy_state: State, buffer_size: int, tmp_path: pathlib.Path):
+    log_file_name = os.path.join(tmp_path, 'output.log')
+    log_destination = FileLogger(filename=log_file_name, buffer_size=buffer_size, flush_interval=1)
+    logger = Logger(dummy_state, destinations=[log_destination])
+    log_destination.run_event(Event.INIT, dummy_state, logger)
+    log_destination.write('[stdout]: ', 'Hello, world!\n')
+    log_destination.run_event(Event.BATCH_END, dummy_state, logger)
+    # Buffered writes should be in the logfile once flushed
+    with open(log_file_name, 'r') as f:
+        assert f.readlines() == ['[stdout]: Hello, world!\n']
+    log_destination.write('[stdout]: ', 'Goodbye, world!\n')
+    log_destination.close(dummy_state, logger)
+    with open(log_file_name, 'r') as f:
+        assert f.readlines() == ['[stdout]: Hello, world!\n', '[stdout]: Goodbye, world!\n']
+
+
+def test_file_logger_without_writev(dummy_state: State, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path):
+    monkeypatch.delattr(os, 'writev', raising=False)
+    log_file_name = os.path.join(tmp_path, 'output.log')
+    log_destination = FileLogger(filename=log_file_name)
+    logger = Logger(dummy_state, destinations=[log_destination])
+    log_destination.run_event(Event.INIT, dummy_state, logger)
+    log_destination.write('[stdout]: ', 'Hello, world!\n')
+    log_destination.close(dummy_state, logger)
+    with open(log_file_name, 'r') as f:
+        assert f.readlines() == ['[stdout]: Hello, world!\n']
+
+
+def test_file_logger_write_error(dummy_state: State, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path):
+    log_file_name = os.path.join(tmp_path, 'output.log')
+    log_destination = FileLogger(filename=log_file_name, flush_interval=1)
+    logger = Logger(dummy_state, destinations=[log_destination])
+    log_destination.run_event(Event.INIT, dummy_state, logger)
+    write_to_file = log_destination._write_to_file
+
+    def fail_once(strings):
+        monkeypatch.setattr(log_destination, '_write_to_file', write_to_file)
+        raise OSError('No space left on device')
+
+    monkeypatch.setattr(log_destination, '_write_to_file', fail_once)
+    log_destination.write('[stdout]: ', 'Hello, world!\n')
+    # The error is raised by the write thread, and should be re-raised in the training loop on the next flush
+    with pytest.raises(OSError, match='No space left on device'):
+        log_destination.run_event(Event.BATCH_END, dummy_state, logger)
+    log_destination.close(dummy_state, logger)
+    # The failed write should be retried
+    with open(log_file_name, 'r') as f:
+        assert f.readlines() == ['[stdout]: Hello, world!\n']
+
+
+def test_file_logger_no_threads_before_init(tmp_path: pathlib.Path):
+    num_threads = threading.active_count()
+    log_destination = FileLogger(filename=os.path.join(tmp_path, 'output.log'),
+                                 capture_stdout=False,
+                                 capture_stderr=False)
+    # Writes before INIT are formatted synchronously, so a logger that is never initialized does not leak a thread
+    log_destination.write('[stdout]: ', 'Hello, world!\n')
+    assert threading.active_count() == num_threads
+
+
+def test_file_logger_fsync_error(dummy_state: State, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path):
+    log_file_name = os.path.join(tmp_path, 'output.log')
+    log_destination = FileLogger(filename=log_file_name, flush_interval=1)
+    logger = Logger(dummy_state, destinations=[log_destination])
+    log_destination.run_event(Event.INIT, dummy_state, logger)
+    fsync = os.fsync
+
+    def fail_once(fd):
+        monkeypatch.setattr(os, 'fsync', fsync)
+        raise OSError('Input/output error')
+
+    monkeypatch.setattr(os, 'fsync', fail_once)
+    log_destination.write('[stdout]: ', 'Hello, world!\n')
+    log_destination.run_event(Event.BATCH_END, dummy_state, logger)
+    # Wait for the fsync thread to fail
+    deadline = time.monotonic() + 10
+    while log_destination._fsync_exception is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # The error is raised by the fsync thread, and should be re-raised in the training loop on the next flush
+    with pytest.raises(OSError, match='Input/output error'):
+        log_destination.run_event(Event.BATCH_END, dummy_state, logger)
+    # The fsync thread should keep running after the error
+    assert log_destination._fsync_thread is not None
+    assert log_destination._fsync_thread.is_alive()
+    log_destination.close(dummy_state, logger)
+    with open(log_file_name, 'r') as f:
+        assert f.readlines() == ['[stdout]: Hello, world!\n']
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='os.fork() is not available')
+def test_file_logger_forked_child(dummy_state: State, tmp_path: pathlib.Path):
+    log_file_name = os.path.join(tmp_path, 'output.log')
+    log_destination = FileLogger(filename=log_file_name)
+    logger = Logger(dummy_state, destinations=[log_destination])
+    log_destination.run_event(Event.INIT, dummy_state, logger)
+    pid = os.fork()
+    if pid == 0:
+        # The write thread does not exist in the child process, so writes should not be left on its queue
+        exit_code = 1
+        try:
+            log_destination.write('[child]: ', 'Hello, from the child process!\n')
+            exit_code = 0
+        finally:
+            os._exit(exit_code)
+    _, status = os.waitpid(pid, 0)
+    assert status == 0
+    log_destination.close(dummy_state, logger)
+    with open(log_file_name, 'r') as f:
+        assert f.readlines() == ['[child]: Hello, from the child process!\n']
+
+
+def test_file_logger_capture_fds(dummy_state: State, tmp_path: pathlib.Path):
+    log_file_name = os.path.join(tmp_path, 'output.log')
+    log_destination = FileLogger(filename=log_file_name, capture_stderr=True, capture_stdout=True, capture_fds=True)
+    # Writes directly to the file descriptors, which bypass sys.stdout and sys.stderr, should be captured
+    os.write(1, b'Hello, fd 1!\n')
+    os.write(2, b'Hello, fd 2!\n')
+    logger = Logger(dummy_state, destinations=[log_destination])
+    log_destination.run_event(Event.INIT, dummy_state, logger)
+    # Not using print(), as pytest replaces sys.stdout with a stream that does not write to file descriptor 1
+    os.write(1, b'Hello again, fd 1!\n')
+    log_destination.close(dummy_state, logger)
+    # Once closed, the original file descriptors should be restored
+    os.write(1, b'SHOULD NOT BE CAPTURED\n')
+    with open(log_file_name, 'r') as f:
+        # Each file descriptor is read by a separate thread, so lines may be in any order
+        assert sorted(f.readlines()) == [
+            '[stderr]: Hello, fd 2!\n',
+            '[stdout]: Hello again, fd 1!\n',
+            '[stdout]: Hello, fd 1!\n',
+        ]
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='os.fork() is not available')
+def test_file_logger_capture_fds_close_with_writing_child(dummy_state: State, tmp_path: pathlib.Path):
+    log_destination = FileLogger(filename=os.path.join(tmp_path, 'output.log'),
+                                 capture_stdout=True,
+                                 capture_stderr=False,
+                                 capture_fds=True)
+    logger = Logger(dummy_state, destinations=[log_destination])
+    log_destination.run_event(Event.INIT, dummy_state, logger)
+    pid = os.fork()
+    if pid == 0:
+        # Like a persistent dataloader worker, the child keeps writing to the inherited pipe
+        try:
+            for _ in range(40):
+                os.write(1, b'Hello, from the child process!\n')
+                time.sleep(0.05)
+        finally:
+            os._exit(0)
+    start = time.monotonic()
+    log_destination.close(dummy_state, logger)
+    # Closing should not wait until the child stops writing
+    assert time.monotonic() - start < 1
+    os.waitpid(pid, 0)
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='os.fork() is not available')
+def test_file_logger_capture_fds_write_after_close_in_child(dummy_state: State, tmp_path: pathlib.Path):
+    log_destination = FileLogger(filename=os.path.join(tmp_path, 'output.log'),
+                                 capture_stdout=True,
+                                 capture_stderr=False,
+                                 capture_fds=True)
+    logger = Logger(dummy_state, destinations=[log_destination])
+    log_destination.run_event(Event.INIT, dummy_state, logger)
+    closed_read_fd, closed_write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            # Fail rather than hang if the write blocks
+            signal.alarm(10)
+            os.close(closed_write_fd)
+            os.read(closed_read_fd, 1)
+            # Write more than the pipe can hold, after the logger is closed in the parent process
+            os.write(1, b'x' * 1024 * 1024)
+        except BrokenPipeError:
+            exit_code = 0
+        finally:
+            os._exit(exit_code)
+    os.close(closed_read_fd)
+    log_destination.close(dummy_state, logger)
+    os.write(closed_write_fd, b'\0')
+    os.close(closed_write_fd)
+    _, status = os.waitpid(pid, 0)
+    assert status == 0
+
+
+def test_file_logger_capture_fds_requires_posix(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path):
+    monkeypatch.setattr(os, 'name', 'nt')
+    with pytest.raises(ValueError):
+        FileLogger(filename=os.path.join(tmp_path, 'output.log'), capture_stdout=True, capture_fds=True)
+
+
+def test_file_logger_capture_fds_reader_error(dummy_state: State, monkeypatch: pytest.MonkeyPatch,
+                                              tmp_path: pathlib.Path):
+
+    def raise_broken_pipe(fd, buffers):
+        raise BrokenPipeError()
+
+    monkeypatch.setattr(file_logger, '_writev', raise_broken_pipe)
+    original_stat = os.fstat(1)
+    log_destination = FileLogger(filename=os.path.join(tmp_path, 'output.log'), capture_stdout=True, capture_fds=True)
+    with pytest.warns(UserWarning):
+        os.write(1, b'Hello, fd 1!\n')
+        log_destination._fd_capture_threads[0].join()
+    # Once the reader thread fails, file descriptor 1 should be restored, rather than left pointing to the unread pipe
+    assert os.path.samestat(os.fstat(1), original_stat)
+    monkeypatch.undo()
+    logger = Logger(dummy_state, destinations=[log_destination])
+    log_destination.close(dummy_state, logger)
+
+
 class ExceptionRaisingCallback(Callback):
 
     def fit_start(self, state: State, logger: Logger) -> None: